@@ -1,11 +1,15 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 from uuid import uuid4
-from api.models import SubmitCodeRequest, WorkflowStatus, ReviewResult
+from api.models import SubmitCodeRequest, WorkflowStatus, ReviewResult, MetricsAggregate
 from workflows.code_review import CodeReviewWorkflow
 from storage.memory_store import InMemoryStore
+from storage.metrics_store import MetricsStore
 
 router = APIRouter()
 store = InMemoryStore()
+metrics_store = MetricsStore()
 
 
 @router.post("/submit", response_model=WorkflowStatus)
@@ -18,9 +22,9 @@ def submit_code(request: SubmitCodeRequest, background_tasks: BackgroundTasks):
 
 
 def _run_workflow(run_id: str, request: SubmitCodeRequest):
-    workflow = CodeReviewWorkflow(store=store)
+    workflow = CodeReviewWorkflow(store=store, metrics=metrics_store)
     try:
-        result = workflow.run(request.code, request.quality_threshold)
+        result = workflow.run(request.code, request.quality_threshold, request.repo_name, request.file_path)
         store.update_run(run_id, {"status": "completed", "result": result.dict()})
     except Exception as e:
         store.update_run(run_id, {"status": "failed", "result": {"error": str(e)}})
@@ -40,3 +44,36 @@ def get_status(run_id: str):
     else:
         rr = None
     return WorkflowStatus(id=run_id, status=entry.get("status"), result=rr)
+
+
+@router.get("/metrics/aggregate", response_model=MetricsAggregate)
+def metrics_aggregate(
+    repo: Optional[str] = None,
+    days: int = Query(30, ge=1, le=3650, description="Window size in days, ending today (UTC)"),
+    metric: str = Query("complexity", description="complexity, lines, issues or quality_score"),
+    percentiles: str = Query("50,90,99", description="Comma separated percentiles"),
+    top_n: int = Query(10, ge=0, le=1000),
+):
+    until = datetime.now(timezone.utc).date()
+    since = until - timedelta(days=days - 1)
+    try:
+        qs = [float(q) for q in percentiles.split(",") if q.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="percentiles must be comma separated numbers")
+    # written as a negated range check so nan and inf are rejected too
+    if any(not (0 <= q <= 100) for q in qs):
+        raise HTTPException(status_code=400, detail="percentiles must be between 0 and 100")
+    try:
+        pct = metrics_store.percentiles(metric, qs, repo=repo, since=since, until=until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return MetricsAggregate(
+        repo=repo,
+        since=since.isoformat(),
+        until=until.isoformat(),
+        metric=metric,
+        count=pct["count"],
+        percentiles=pct["percentiles"],
+        trend=metrics_store.trend(repo=repo, since=since, until=until),
+        worst_functions=metrics_store.worst_functions(top_n, repo=repo, since=since, until=until),
+    )
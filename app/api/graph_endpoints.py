@@ -17,6 +17,7 @@ registry = ToolRegistry()
 registry.register("extract_functions", code_review.extract_functions)
 registry.register("cyclomatic_complexity", code_review.cyclomatic_complexity)
 registry.register("detect_basic_issues", code_review.detect_basic_issues)
+registry.register("function_metrics", code_review.function_metrics)
 registry.register("suggest_improvements", code_review.suggest_improvements)
 # register scoring + predicate tools
 registry.register("compute_quality", code_review.compute_quality_score)
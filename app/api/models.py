@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 
 class SubmitCodeRequest(BaseModel):
     repo_name: Optional[str] = Field(None, description="Optional repo name")
@@ -53,3 +53,34 @@ class GraphRunResponse(BaseModel):
     state: Optional[Dict[str, Any]] = None
     log: Optional[List[Dict[str, Any]]] = None
     iterations: Optional[int] = None
+
+
+# Metrics history schemas for /api/metrics/aggregate
+class DailyTrend(BaseModel):
+    day: str
+    runs: int
+    mean_quality_score: Optional[float] = None
+    functions: int
+    mean_complexity: Optional[float] = None
+    max_complexity: Optional[int] = None
+
+
+class FunctionMetric(BaseModel):
+    repo: str
+    file_path: Optional[str] = None
+    name: str
+    complexity: int
+    lines: int
+    issues: int
+    day: str
+
+
+class MetricsAggregate(BaseModel):
+    repo: Optional[str] = None
+    since: str
+    until: str
+    metric: str
+    count: int
+    percentiles: Dict[str, float]
+    trend: List[DailyTrend]
+    worst_functions: List[FunctionMetric]
@@ -0,0 +1 @@
+# makes pytest put app/ on sys.path so tests import modules the way uvicorn main:app does
@@ -0,0 +1,268 @@
+from datetime import date, datetime, timezone
+from threading import RLock
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import time
+
+import numpy as np
+
+DEFAULT_REPO = "default"
+
+# column name -> dtype for the two tables kept in every partition
+FUNCTION_COLUMNS = {
+    "ts": np.float64,
+    "file": np.int32,
+    "name": np.int32,
+    "complexity": np.int32,
+    "lines": np.int32,
+    "issues": np.int32,
+}
+RUN_COLUMNS = {
+    "ts": np.float64,
+    "quality_score": np.float64,
+    "functions": np.int32,
+    "issues": np.int32,
+}
+
+
+def _histogram(columns: List[np.ndarray]) -> np.ndarray:
+    """Value counts of non-negative integer columns, summed across partitions."""
+    counts = np.zeros(1, dtype=np.int64)
+    for col in columns:
+        if col.size == 0:
+            continue
+        part = np.bincount(col)
+        if part.size > counts.size:
+            part[: counts.size] += counts
+            counts = part
+        else:
+            counts[: part.size] += part
+    return counts
+
+
+def _percentiles_from_histogram(counts: np.ndarray, qs: Sequence[float]) -> np.ndarray:
+    """Same result as np.percentile's default linear method, without sorting the rows."""
+    cdf = np.cumsum(counts)
+    pos = np.asarray(qs, dtype=np.float64) / 100.0 * (cdf[-1] - 1)
+    lo = np.floor(pos)
+    v_lo = np.searchsorted(cdf, lo, side="right")
+    v_hi = np.searchsorted(cdf, np.ceil(pos), side="right")
+    return v_lo + (v_hi - v_lo) * (pos - lo)
+
+
+class _ColumnTable:
+    """Append-only set of equally sized NumPy columns with amortized growth."""
+
+    def __init__(self, columns: Dict[str, Any], capacity: int = 256):
+        self._cols = {name: np.empty(capacity, dtype=dtype) for name, dtype in columns.items()}
+        self.size = 0
+
+    def append(self, rows: Dict[str, Sequence[Any]]):
+        n = len(next(iter(rows.values())))
+        if n == 0:
+            return
+        needed = self.size + n
+        capacity = len(next(iter(self._cols.values())))
+        if needed > capacity:
+            while capacity < needed:
+                capacity *= 2
+            for name, col in self._cols.items():
+                grown = np.empty(capacity, dtype=col.dtype)
+                grown[: self.size] = col[: self.size]
+                self._cols[name] = grown
+        for name, col in self._cols.items():
+            col[self.size : needed] = rows[name]
+        self.size = needed
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        # views stay valid after later appends: growth swaps in new arrays and
+        # writes only land past the snapshot's size
+        return {name: col[: self.size] for name, col in self._cols.items()}
+
+
+class _Partition:
+    def __init__(self):
+        self.functions = _ColumnTable(FUNCTION_COLUMNS)
+        self.runs = _ColumnTable(RUN_COLUMNS)
+
+
+class MetricsStore:
+    """Columnar history of review metrics, partitioned by repo and UTC day.
+
+    Every review appends one row per function (complexity, lines, issues) and
+    one row per run (quality_score). Strings are dictionary encoded so that the
+    columns stay numeric and aggregates are plain NumPy reductions.
+    """
+
+    def __init__(self):
+        self._partitions: Dict[Tuple[str, date], _Partition] = {}
+        self._strings: List[str] = []
+        self._string_codes: Dict[str, int] = {}
+        self._lock = RLock()
+
+    def _encode(self, value: str) -> int:
+        code = self._string_codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._string_codes[value] = code
+        return code
+
+    def record_review(
+        self,
+        repo: Optional[str],
+        file_path: Optional[str],
+        functions: List[Dict[str, Any]],
+        quality_score: float,
+        issue_count: int,
+        ts: Optional[float] = None,
+    ):
+        ts = time.time() if ts is None else ts
+        day = datetime.fromtimestamp(ts, tz=timezone.utc).date()
+        repo = repo or DEFAULT_REPO
+        n = len(functions)
+        with self._lock:
+            part = self._partitions.get((repo, day))
+            if part is None:
+                part = self._partitions[(repo, day)] = _Partition()
+            file_code = self._encode(file_path or "")
+            part.functions.append({
+                "ts": [ts] * n,
+                "file": [file_code] * n,
+                "name": [self._encode(f["name"]) for f in functions],
+                "complexity": [f.get("complexity", 0) for f in functions],
+                "lines": [f.get("lines", 0) for f in functions],
+                "issues": [f.get("issues", 0) for f in functions],
+            })
+            part.runs.append({
+                "ts": [ts],
+                "quality_score": [quality_score],
+                "functions": [n],
+                "issues": [issue_count],
+            })
+
+    def repos(self) -> List[str]:
+        with self._lock:
+            return sorted({repo for repo, _ in self._partitions})
+
+    def _snapshots(self, tables: Sequence[str], repo: Optional[str], since: Optional[date], until: Optional[date]):
+        """Matching partition keys, column views per requested table, and the string dictionary."""
+        with self._lock:
+            keys = sorted(
+                k for k in self._partitions
+                if (repo is None or k[0] == repo)
+                and (since is None or k[1] >= since)
+                and (until is None or k[1] <= until)
+            )
+            snaps = [[getattr(self._partitions[k], t).snapshot() for k in keys] for t in tables]
+            strings = list(self._strings)
+        return keys, snaps, strings
+
+    def percentiles(
+        self,
+        metric: str,
+        qs: Sequence[float],
+        repo: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """Percentiles of a function column (complexity, lines, issues) or of quality_score."""
+        if metric == "quality_score":
+            _, (snaps,), _ = self._snapshots(("runs",), repo, since, until)
+            values = np.concatenate([s[metric] for s in snaps]) if snaps else np.empty(0)
+            count = int(values.size)
+            result = np.percentile(values, list(qs)) if count else []
+        elif metric in ("complexity", "lines", "issues"):
+            # function columns are small non-negative ints: merge per-partition
+            # histograms instead of concatenating and sorting millions of rows
+            _, (snaps,), _ = self._snapshots(("functions",), repo, since, until)
+            counts = _histogram([s[metric] for s in snaps])
+            count = int(counts.sum())
+            result = _percentiles_from_histogram(counts, qs) if count else []
+        else:
+            raise ValueError(f"Unknown metric: {metric}")
+        return {
+            "metric": metric,
+            "count": count,
+            "percentiles": {f"p{q:g}": float(v) for q, v in zip(qs, result)},
+        }
+
+    def trend(
+        self,
+        repo: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        """Per-day run count, mean quality_score and mean/max function complexity."""
+        # partitions are per day, so each one reduces independently and only
+        # the per-day totals get merged across repos
+        keys, (run_snaps, func_snaps), _ = self._snapshots(("runs", "functions"), repo, since, until)
+        days: Dict[date, Dict[str, Any]] = {}
+        for key, runs, funcs in zip(keys, run_snaps, func_snaps):
+            bucket = days.setdefault(key[1], {"runs": 0, "quality": 0.0, "functions": 0, "complexity": 0, "max": None})
+            bucket["runs"] += int(runs["ts"].size)
+            bucket["quality"] += float(runs["quality_score"].sum())
+            complexity = funcs["complexity"]
+            if complexity.size:
+                bucket["functions"] += int(complexity.size)
+                bucket["complexity"] += int(complexity.sum(dtype=np.int64))
+                peak = int(complexity.max())
+                bucket["max"] = peak if bucket["max"] is None else max(bucket["max"], peak)
+        out = []
+        for day in sorted(days):
+            bucket = days[day]
+            out.append({
+                "day": day.isoformat(),
+                "runs": bucket["runs"],
+                "mean_quality_score": bucket["quality"] / bucket["runs"] if bucket["runs"] else None,
+                "functions": bucket["functions"],
+                "mean_complexity": bucket["complexity"] / bucket["functions"] if bucket["functions"] else None,
+                "max_complexity": bucket["max"],
+            })
+        return out
+
+    def worst_functions(
+        self,
+        n: int = 10,
+        repo: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        """Top-n function rows by complexity, ties broken by length."""
+        keys, (snaps,), strings = self._snapshots(("functions",), repo, since, until)
+        counts = _histogram([s["complexity"] for s in snaps])
+        if n <= 0 or counts.sum() == 0:
+            return []
+        # lowest complexity that can still make the top n; only rows at or
+        # above it are gathered and ranked
+        cutoff = int(np.searchsorted(np.cumsum(counts[::-1]), n))
+        cutoff = max(0, counts.size - 1 - cutoff)
+        parts, rows, sort_keys = [], [], []
+        for part, snap in enumerate(snaps):
+            hit = np.flatnonzero(snap["complexity"] >= cutoff)
+            if hit.size:
+                parts.append(np.full(hit.size, part))
+                rows.append(hit)
+                # single int64 sort key so ranking is one argpartition
+                sort_keys.append(snap["complexity"][hit].astype(np.int64) << 32 | snap["lines"][hit].astype(np.int64))
+        parts = np.concatenate(parts)
+        rows = np.concatenate(rows)
+        key = np.concatenate(sort_keys)
+        size = key.size
+        if n < size:
+            order = np.argpartition(key, size - n)[size - n :]
+        else:
+            order = np.arange(size)
+        order = order[np.argsort(key[order])[::-1]]
+        out = []
+        for i in order:
+            (repo_name, day), snap, row = keys[parts[i]], snaps[parts[i]], rows[i]
+            out.append({
+                "repo": repo_name,
+                "file_path": strings[snap["file"][row]] or None,
+                "name": strings[snap["name"][row]],
+                "complexity": int(snap["complexity"][row]),
+                "lines": int(snap["lines"][row]),
+                "issues": int(snap["issues"][row]),
+                "day": day.isoformat(),
+            })
+        return out
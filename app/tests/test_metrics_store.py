@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from storage.metrics_store import MetricsStore, _histogram, _percentiles_from_histogram
+
+QS = [0, 1, 10, 25, 33.3, 50, 75, 90, 99, 99.9, 100]
+DAY = 86400.0
+T0 = 1_700_000_000.0
+
+
+def _fill(store, rng, repos=("r1", "r2"), days=3, runs=4, funcs=50, max_complexity=8):
+    rows = []
+    for d in range(days):
+        for repo in repos:
+            for r in range(runs):
+                complexity = rng.integers(1, max_complexity, funcs)
+                lines = rng.integers(1, 5, funcs)
+                fns = [
+                    {"name": f"{repo}_{d}_{r}_{i}", "complexity": int(c), "lines": int(l), "issues": 0}
+                    for i, (c, l) in enumerate(zip(complexity, lines))
+                ]
+                store.record_review(repo, "a.py", fns, 0.5, 0, ts=T0 + d * DAY)
+                rows.extend((repo, f["name"], f["complexity"], f["lines"]) for f in fns)
+    return rows
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_histogram_percentiles_match_numpy(seed):
+    rng = np.random.default_rng(seed)
+    parts = [rng.integers(0, rng.integers(1, 60), rng.integers(1, 500)) for _ in range(rng.integers(1, 6))]
+    values = np.concatenate(parts)
+    result = _percentiles_from_histogram(_histogram(parts), QS)
+    assert np.allclose(result, np.percentile(values, QS))
+
+
+def test_histogram_percentiles_single_row():
+    assert np.allclose(_percentiles_from_histogram(_histogram([np.array([7])]), QS), 7.0)
+
+
+def test_store_percentiles_match_numpy():
+    store = MetricsStore()
+    rows = _fill(store, np.random.default_rng(0))
+    complexity = np.array([r[2] for r in rows])
+    result = store.percentiles("complexity", QS)
+    assert result["count"] == complexity.size
+    assert np.allclose(list(result["percentiles"].values()), np.percentile(complexity, QS))
+
+    r1 = np.array([r[2] for r in rows if r[0] == "r1"])
+    result = store.percentiles("complexity", QS, repo="r1")
+    assert np.allclose(list(result["percentiles"].values()), np.percentile(r1, QS))
+
+
+def test_worst_functions_match_full_sort_with_ties():
+    store = MetricsStore()
+    # few distinct complexities so the cutoff value is shared by many rows
+    rows = _fill(store, np.random.default_rng(1), max_complexity=4)
+    expected = sorted(((c, l) for _, _, c, l in rows), reverse=True)
+    for n in (1, 7, 25, 100, len(rows) - 1):
+        got = [(f["complexity"], f["lines"]) for f in store.worst_functions(n)]
+        assert got == expected[:n]
+
+
+def test_worst_functions_n_larger_than_rows():
+    store = MetricsStore()
+    rows = _fill(store, np.random.default_rng(2), repos=("r1",), days=1, runs=1, funcs=5)
+    got = store.worst_functions(100)
+    assert len(got) == len(rows)
+    assert [(f["complexity"], f["lines"]) for f in got] == sorted(((c, l) for _, _, c, l in rows), reverse=True)
+
+
+def test_empty_window():
+    store = MetricsStore()
+    assert store.percentiles("complexity", QS) == {"metric": "complexity", "count": 0, "percentiles": {}}
+    assert store.worst_functions(10) == []
+    assert store.trend() == []
+
+    _fill(store, np.random.default_rng(3), days=1)
+    assert store.percentiles("complexity", QS, repo="missing")["count"] == 0
+    assert store.worst_functions(10, repo="missing") == []
+    assert store.trend(repo="missing") == []
@@ -5,6 +5,7 @@ from engine.graph import GraphEngine
 from engine.node import Node
 from engine.state import StateManager
 from storage.memory_store import InMemoryStore
+from storage.metrics_store import MetricsStore
 from api.models import ReviewResult
 import httpx
 import os
@@ -66,6 +67,24 @@ def detect_basic_issues(inputs: Dict[str, Any]) -> Dict[str, Any]:
     return {"issues": issues}
 
 
+def function_metrics(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Join complexities with line-level issues falling inside each function's span."""
+    funcs = inputs.get("functions", [])
+    complexities = inputs.get("complexities", [])
+    issue_lines = []
+    for issue in inputs.get("issues", []):
+        if issue.startswith("Line "):
+            try:
+                issue_lines.append(int(issue[5:].split(":", 1)[0]))
+            except ValueError:
+                pass
+    metrics = []
+    for f, c in zip(funcs, complexities):
+        issues = sum(1 for ln in issue_lines if f["start"] <= ln <= f["end"])
+        metrics.append({"name": f["name"], "complexity": c["complexity"], "lines": c["lines"], "issues": issues})
+    return {"function_metrics": metrics}
+
+
 def suggest_improvements(inputs: Dict[str, Any]) -> Dict[str, Any]:
     suggestions: List[str] = []
     complexities = inputs.get("complexities", [])
@@ -107,8 +126,9 @@ def quality_below_threshold(state: Dict[str, Any]) -> bool:
 
 
 class CodeReviewWorkflow:
-    def __init__(self, store: InMemoryStore = None):
+    def __init__(self, store: InMemoryStore = None, metrics: MetricsStore = None):
         self.store = store or InMemoryStore()
+        self.metrics = metrics
         self.state = StateManager()
 
     def _call_gemini(self, prompt: str) -> str:
@@ -129,12 +149,13 @@ class CodeReviewWorkflow:
                 last_err = e
         return f"[LLM error: {last_err}]"
 
-    def run(self, code: str, quality_threshold: float = 0.8) -> ReviewResult:
+    def run(self, code: str, quality_threshold: float = 0.8, repo_name: str = None, file_path: str = None) -> ReviewResult:
         # Build simple pipeline using our functions
         ctx = {"code": code}
         ctx.update(extract_functions(ctx))
         ctx.update(cyclomatic_complexity(ctx))
         ctx.update(detect_basic_issues(ctx))
+        ctx.update(function_metrics(ctx))
         ctx.update(suggest_improvements(ctx))
 
         # compute a naive quality score
@@ -175,6 +196,10 @@ class CodeReviewWorkflow:
 
         final_score = min(1.0, current_score)
 
+        if self.metrics is not None:
+            # function_metrics holds the measured values, untouched by the loop above
+            self.metrics.record_review(repo_name, file_path, ctx["function_metrics"], final_score, len(issues))
+
         result = ReviewResult(
             quality_score=final_score,
             issues=issues,